@@ -3,9 +3,14 @@
 # -------------------------------------------------
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
+from itertools import repeat
 from zoneinfo import ZoneInfo
+import hashlib
+import io
 import json
+import os
 import re
 
 # -------------------------------------------------
@@ -20,41 +25,49 @@ st.set_page_config(
 APP_TITLE = "Coffee & Connect — 2026 Schedule (Atul + 4)"
 IST = ZoneInfo("Asia/Kolkata")  # Chennai timezone
 DEFAULT_FILE = "Coffee_Connect_2026_Schedule.xlsx"
+CATEGORY_COLS = ["Month", "Week", "Location Focus", "Team Focus", "Mode of Connect", "Day"]
 
 # -------------------------------------------------
 # Utilities
 # -------------------------------------------------
-def clean_text(x: str) -> str:
-    """Remove Excel artifacts like _x000D_ and stray control chars."""
-    if not isinstance(x, str):
-        return x
-    x = re.sub(r"_x000D_", " ", x)           # remove Excel line-break artifact
-    x = re.sub(r"[\u0000-\u001F]+", " ", x)  # strip control chars
-    return " ".join(x.split())
-
-def parse_time_range(tstr: str):
+# Excel line-break artifact (_x000D_) or a run of stray control chars
+_JUNK_RE = re.compile(r"_x000D_|[\u0000-\u001F]+")
+_WS_RE = re.compile(r"\s+")
+
+def clean_text_series(s: pd.Series) -> pd.Series:
     """
-    Parse '15:30–16:00 IST' or '15:30-16:00 IST' into (start_time, end_time).
-    If end is missing, default to +30 mins duration later in enrich function.
+    Remove Excel artifacts like _x000D_ and stray control chars from a column,
+    collapsing whitespace. Non-string cells are passed through untouched.
     """
-    if not isinstance(tstr, str):
-        return None, None
-    s = clean_text(tstr).replace(" IST", "").strip()
-    s = s.replace("–", "-")
-    parts = [p.strip() for p in s.split("-")]
-    start_t = None
-    end_t = None
     try:
-        start_t = datetime.strptime(parts[0], "%H:%M").time()
-    except Exception:
-        start_t = None
-    if len(parts) > 1:
-        try:
-            end_t = datetime.strptime(parts[1], "%H:%M").time()
-        except Exception:
-            end_t = None
-    return start_t, end_t
+        cleaned = (
+            s.str.replace(_JUNK_RE, " ", regex=True)
+            .str.replace(_WS_RE, " ", regex=True)
+            .str.strip()
+        )
+    except AttributeError:
+        # .str is unavailable when an object column holds no strings at all
+        return s
+    return cleaned.where(cleaned.notna(), s)
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_excel(src, mtime: float | None = None) -> pd.DataFrame:
+    """
+    Read the schedule workbook once per distinct input.
+    `src` is either the uploaded file's bytes or a path; for a path, pass its
+    mtime so edits on disk invalidate the cache.
+    """
+    if isinstance(src, bytes):
+        src = io.BytesIO(src)
+    try:
+        return pd.read_excel(src, engine="calamine")  # Rust reader, much faster
+    except ImportError:
+        # python-calamine not installed; real parse errors still propagate
+        if hasattr(src, "seek"):
+            src.seek(0)
+        return pd.read_excel(src, engine="openpyxl")
+
+@st.cache_data(show_spinner=False, max_entries=8)
 def enrich_schedule(df: pd.DataFrame) -> pd.DataFrame:
     """
     Build Start/End datetimes (IST) and clean text fields.
@@ -62,74 +75,153 @@ def enrich_schedule(df: pd.DataFrame) -> pd.DataFrame:
     Expected columns (from your Excel):
     Month #, Month, Week, Date, Day, Time, Location Focus, Team Focus,
     Participants (4), Manager, Notes, Mode of Connect.
-    """
-    df = df.copy()
 
+    Modifies `df` in place: st.cache_data hands every caller its own copy of
+    the loaded sheet, so a defensive .copy() here is wasted work.
+    """
     # Clean text columns
-    for col in df.columns:
-        if df[col].dtype == "object":
-            df[col] = df[col].apply(clean_text)
-
-    # Parse date/time into datetimes
-    starts, ends = [], []
-    for _, row in df.iterrows():
-        date_str = str(row.get("Date", "")).strip()
-        time_str = str(row.get("Time", "")).strip()
-        try:
-            d = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except Exception:
-            d = None
-
-        stime, etime = parse_time_range(time_str)
-        if d and stime:
-            start_dt = datetime.combine(d, stime).replace(tzinfo=IST)
-        else:
-            start_dt = None
-        if d and etime:
-            end_dt = datetime.combine(d, etime).replace(tzinfo=IST)
-        else:
-            end_dt = start_dt + timedelta(minutes=30) if start_dt else None
-
-        starts.append(start_dt)
-        ends.append(end_dt)
-
-    df["Start (IST)"] = starts
-    df["End (IST)"] = ends
+    obj_cols = df.select_dtypes(include=["object", "string"]).columns
+    df[obj_cols] = df[obj_cols].apply(clean_text_series)
+
+    # Parse date/time into datetimes, column-wise.
+    # Time looks like '15:30–16:00 IST' or '15:30-16:00 IST'; end may be missing.
+    blank = pd.Series("", index=df.index)
+    date_col = df.get("Date", blank)
+    time_s = (
+        df.get("Time", blank).astype(str)
+        .str.replace("–", "-", regex=False)
+        .str.replace(" IST", "", regex=False)
+    )
+    # Fixed groups, so both columns exist even for an empty or all-blank sheet
+    parts = time_s.str.extract(r"^([^-]*)-?(.*)$")
+    start_s, end_s = parts[0].str.strip(), parts[1].str.strip()
+
+    # One path for text dates, Excel date cells (datetime64) and a mix of both
+    # (object column): an explicit format keeps pandas off the slow dateutil
+    # inference, and the times are then added as offsets.
+    day = pd.to_datetime(date_col, format="%Y-%m-%d", errors="coerce").dt.normalize()
+    start_dt = day + pd.to_timedelta(start_s + ":00", errors="coerce")
+    end_dt = day + pd.to_timedelta(end_s + ":00", errors="coerce")
+    # Pin the resolution: pandas 3 infers seconds for an all-NaT result, which
+    # then rejects comparisons/searchsorted against a microsecond `now`.
+    start_dt = start_dt.dt.tz_localize(IST).dt.as_unit("ns")
+    end_dt = end_dt.dt.tz_localize(IST).dt.as_unit("ns")
+
+    # Native datetime64[..., Asia/Kolkata] columns, not object columns of
+    # per-row datetimes, so sorting/comparison/.dt stay in compiled code.
+    df["Start (IST)"] = start_dt
+    df["End (IST)"] = end_dt.fillna(start_dt + timedelta(minutes=30))
+    # ICS timestamps (UTC), formatted once here rather than per export
+    df["_start_utc"] = df["Start (IST)"].dt.tz_convert("UTC").dt.strftime("%Y%m%dT%H%M%SZ")
+    df["_end_utc"] = df["End (IST)"].dt.tz_convert("UTC").dt.strftime("%Y%m%dT%H%M%SZ")
 
     # If Month # or Day missing, reconstruct from datetime
-    if "Month #" not in df.columns:
+    cols = set(df.columns)
+    if "Month #" not in cols:
         df["Month #"] = df["Start (IST)"].dt.month
-    if "Day" not in df.columns:
+    if "Day" not in cols:
         df["Day"] = df["Start (IST)"].dt.strftime("%a")
+        cols.add("Day")
+
+    # Low-cardinality columns: categorical so unique()/isin() work on int codes.
+    # Inferred categories are already sorted, which the filter options rely on.
+    for col in CATEGORY_COLS:
+        if col in cols:
+            df[col] = df[col].astype("category")
 
-    # Ensure sorted
+    # Ensure sorted, with Start also as the index for searchsorted lookups.
+    # Unparseable starts (NaT) stay last, matching numpy's ordering (NaT after
+    # every timestamp), so binary search on the index stays correct.
     df = df.sort_values(["Start (IST)", "Week"])
+    df.index = pd.DatetimeIndex(df["Start (IST)"]).rename(None)
     return df
 
-def upcoming_between(df: pd.DataFrame, now: datetime, horizon: timedelta) -> pd.DataFrame:
-    """Sessions starting between now and now+horizon."""
-    mask = (df["Start (IST)"] > now) & (df["Start (IST)"] <= now + horizon)
-    return df.loc[mask].sort_values("Start (IST)")
+def isin_mask(series: pd.Series, selected: list, options: list):
+    """
+    Boolean mask for one multiselect filter, or None when it filters nothing
+    (every option selected and no blanks in the column), so it can be skipped.
+    """
+    if set(selected) >= set(options) and not series.hasnans:
+        return None
+    return series.isin(selected).to_numpy()
+
+def upcoming_within(future: pd.DataFrame, now: datetime, horizon: timedelta) -> pd.DataFrame:
+    """
+    Sessions starting between now and now+horizon.
+    `future` must hold only sessions after `now`, indexed and sorted by start,
+    so this is a binary search plus a leading slice rather than a full mask.
+    """
+    return future.iloc[:future.index.searchsorted(now + horizon, side="right")]
+
+def display_text(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    """`cols` of df as strings, with blank cells as "" on every pandas version."""
+    return df[cols].astype(object).fillna("").astype(str)
 
 def toast_events(df: pd.DataFrame, label: str):
     """Show Streamlit toasts (in-app) for upcoming events."""
-    for _, r in df.iterrows():
+    if df.empty:
+        return
+    rows = display_text(df, ["Week", "Participants (4)", "Mode of Connect"])
+    rows = rows.assign(start=df["Start (IST)"].to_numpy())
+    for week, parts, mode, start in rows.itertuples(index=False, name=None):
         st.toast(
-            f"🔔 {label}: {r['Week']} • "
-            f"{r['Start (IST)'].strftime('%b %d, %Y %I:%M %p')} • "
-            f"Participants: {r['Participants (4)']} • Mode: {r.get('Mode of Connect','')}"
+            f"🔔 {label}: {week} • "
+            f"{start.strftime('%b %d, %Y %I:%M %p')} • "
+            f"Participants: {parts} • Mode: {mode}"
         )
 
+def notification_events(rows: pd.DataFrame) -> list:
+    """Build the event records (title, body, start in epoch ms) for the browser JS."""
+    rows = rows.dropna(subset=["Start (IST)"])
+    start = rows["Start (IST)"]
+    text = display_text(rows, ["Week", "Participants (4)", "Location Focus", "Mode of Connect"])
+    week = text["Week"]
+    payload = pd.DataFrame({
+        "id": start.dt.strftime("%Y%m%d%H%M") + "-" + week,
+        "title": week + " — " + start.dt.strftime("%b %d, %I:%M %p IST"),
+        "body": (
+            "Participants: " + text["Participants (4)"] +
+            " • Focus: " + text["Location Focus"] +
+            " • Mode: " + text["Mode of Connect"]
+        ),
+        "start_ts": start.dt.as_unit("ms").astype("int64"),
+    })
+    return payload.to_dict("records")
+
 def js_browser_notifications(events):
     """
     Inject JS to trigger browser notifications 1 day and 30 minutes prior.
     Requires user to click 'Enable browser notifications' and keep the tab open.
+    Also renders the page's only "next session" display: a client-side
+    countdown driven by the same events, so it stays current without reruns.
     """
-    payload = json.dumps(events)
-    st.components.v1.html(f"""
+    # Deterministic, compact JSON: unchanged events yield byte-identical HTML,
+    # which lets the frontend keep the existing iframe and its pending timers.
+    payload = json.dumps(events, separators=(",", ":"))
+    html = f"""
+    <div id="next-countdown" style="margin:0.25rem 0; font-family:sans-serif;"></div>
     <script>
       const events = {payload};
 
+      function tickCountdown() {{
+        const el = document.getElementById('next-countdown');
+        const now = Date.now();
+        // events are sorted by start time, so the first future one is next
+        const next = events.find(ev => ev.start_ts > now);
+        if (!next) {{
+          el.textContent = "No future sessions in the current filter.";
+          return;
+        }}
+        let s = Math.floor((next.start_ts - now) / 1000);
+        const d = Math.floor(s / 86400); s %= 86400;
+        const h = Math.floor(s / 3600); s %= 3600;
+        const m = Math.floor(s / 60); s %= 60;
+        const pad = n => String(n).padStart(2, "0");
+        el.textContent = "⏱️ Next session in " + d + "d " + pad(h) + "h " + pad(m) + "m " + pad(s) + "s — " + next.title + " • " + next.body;
+      }}
+      tickCountdown();
+      setInterval(tickCountdown, 1000);
+
       function notifyNow(title, body) {{
         try {{
           new Notification(title, {{ body: body }});
@@ -184,45 +276,48 @@ def js_browser_notifications(events):
         🔔 Enable browser notifications
       </button>
     </div>
-    """, height=80)
-
-def ics_from_rows(rows: pd.DataFrame, cal_name="Coffee & Connect 2026"):
-    """Generate one ICS string from selected rows."""
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//CoffeeConnect//Schedule//EN",
-        f"X-WR-CALNAME:{cal_name}"
-    ]
-    for _, r in rows.iterrows():
-        start = r["Start (IST)"]
-        end = r["End (IST)"]
-        if not isinstance(start, datetime) or not isinstance(end, datetime):
-            continue
-        dtstart_utc = start.astimezone(ZoneInfo("UTC")).strftime("%Y%m%dT%H%M%SZ")
-        dtend_utc = end.astimezone(ZoneInfo("UTC")).strftime("%Y%m%dT%H%M%SZ")
-        uid = f"{dtstart_utc}-{r.get('Week','W')}-coffee-connect@atul"
-        summary = f"Coffee & Connect — {r.get('Week','')}"
-        desc = (
-            f"Manager: {r.get('Manager','Atul Anand')}\n"
-            f"Participants: {r.get('Participants (4)','')}\n"
-            f"Focus: {r.get('Location Focus','')}\n"
-            f"Mode: {r.get('Mode of Connect','')}"
-        )
-        loc = r.get("Location Focus", "")
-        lines += [
-            "BEGIN:VEVENT",
-            f"UID:{uid}",
-            f"DTSTAMP:{dtstart_utc}",
-            f"DTSTART:{dtstart_utc}",
-            f"DTEND:{dtend_utc}",
-            f"SUMMARY:{summary}",
-            f"DESCRIPTION:{desc}",
-            f"LOCATION:{loc}",
+    """
+    st.components.v1.html(html, height=130)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def ics_from_rows(_rows: pd.DataFrame, cache_key, cal_name="Coffee & Connect 2026") -> bytes:
+    """
+    Generate one ICS file (UTF-8 bytes) from selected rows.
+    Uses the _start_utc/_end_utc strings precomputed by enrich_schedule.
+
+    Memoized on (cache_key, cal_name) only: the leading underscore tells
+    st.cache_data not to hash `_rows`, so a cache hit costs nothing per rerun.
+    `cache_key` must change whenever the rows do.
+    """
+    rows = _rows.dropna(subset=["Start (IST)", "End (IST)"])
+
+    def col(name, default=""):
+        return display_text(rows, [name])[name] if name in rows.columns else repeat(default)
+
+    buf = bytearray(
+        b"BEGIN:VCALENDAR\r\n"
+        b"VERSION:2.0\r\n"
+        b"PRODID:-//CoffeeConnect//Schedule//EN\r\n"
+        + f"X-WR-CALNAME:{cal_name}".encode("utf-8")
+    )
+    for s, e, uid_w, w, mgr, parts, loc, mode in zip(
+        rows["_start_utc"], rows["_end_utc"], col("Week", "W"), col("Week"),
+        col("Manager", "Atul Anand"), col("Participants (4)"),
+        col("Location Focus"), col("Mode of Connect"),
+    ):
+        buf += (
+            "\r\nBEGIN:VEVENT\r\n"
+            f"UID:{s}-{uid_w}-coffee-connect@atul\r\n"
+            f"DTSTAMP:{s}\r\n"
+            f"DTSTART:{s}\r\n"
+            f"DTEND:{e}\r\n"
+            f"SUMMARY:Coffee & Connect — {w}\r\n"
+            f"DESCRIPTION:Manager: {mgr}\nParticipants: {parts}\nFocus: {loc}\nMode: {mode}\r\n"
+            f"LOCATION:{loc}\r\n"
             "END:VEVENT"
-        ]
-    lines.append("END:VCALENDAR")
-    return "\r\n".join(lines)
+        ).encode("utf-8")
+    buf += b"\r\nEND:VCALENDAR"
+    return bytes(buf)
 
 def download_bytes(name: str, data: bytes, mime: str = "text/calendar"):
     st.download_button(
@@ -232,42 +327,17 @@ def download_bytes(name: str, data: bytes, mime: str = "text/calendar"):
         mime=mime
     )
 
-def safe_autorefresh(interval_ms: int = 60_000, key: str = "refresh_key"):
-    """
-    Calls Streamlit's auto-refresh if available; no-ops otherwise.
-    Works across multiple Streamlit versions.
-    """
-    # Try the importable function (newer releases)
-    try:
-        from streamlit import st_autorefresh as _st_autorefresh
-        _st_autorefresh(interval=interval_ms, key=key)
-        return
-    except Exception:
-        pass
-
-    # Try attributes on st
-    st_autorefresh_attr = getattr(st, "autorefresh", None) or getattr(st, "st_autorefresh", None)
-    if callable(st_autorefresh_attr):
-        st_autorefresh_attr(interval=interval_ms, key=key)
-        return
-
-    # Optional: last-resort JS hard reload (commented by default)
-    # st.components.v1.html(
-    #     f"<script>setTimeout(() => window.parent.location.reload(), {interval_ms});</script>",
-    #     height=0
-    # )
-    return
-
 # -------------------------------------------------
-# Sidebar — file & refresh
+# Sidebar — file
 # -------------------------------------------------
 st.sidebar.title("⚙️ Controls")
 uploaded = st.sidebar.file_uploader("Upload Coffee_Connect_2026_Schedule.xlsx", type=["xlsx"])
-file_source = uploaded if uploaded else DEFAULT_FILE
 
-# Auto-refresh every minute to keep reminders current
-st.sidebar.info("Auto-refresh: ON (every 60s) — ensures reminders stay accurate.")
-safe_autorefresh(60_000, "refresh_key")
+# No timed rerun: only the countdown ticks in the browser (see js_browser_notifications)
+st.sidebar.info(
+    "The next-session countdown updates live. Upcoming counts, tables and in-app "
+    "reminders refresh only when you interact with the page (e.g. change a filter)."
+)
 
 # -------------------------------------------------
 # Load file
@@ -275,7 +345,15 @@ safe_autorefresh(60_000, "refresh_key")
 st.title(APP_TITLE)
 
 try:
-    df_raw = pd.read_excel(file_source, engine="openpyxl")
+    # data_key identifies the loaded data across reruns (see Filters)
+    if uploaded:
+        data = uploaded.getvalue()
+        data_key = hashlib.sha256(data).hexdigest()
+        df_raw = load_excel(data)
+    else:
+        mtime = os.path.getmtime(DEFAULT_FILE)
+        data_key = (DEFAULT_FILE, mtime)
+        df_raw = load_excel(DEFAULT_FILE, mtime)
 except Exception as e:
     st.error(f"Could not read the schedule file: {e}")
     st.stop()
@@ -285,7 +363,8 @@ expected_cols = [
     "Month #","Month","Week","Date","Day","Time","Location Focus",
     "Team Focus","Participants (4)","Manager","Notes","Mode of Connect"
 ]
-missing = [c for c in expected_cols if c not in df_raw.columns]
+cols = set(df_raw.columns)
+missing = [c for c in expected_cols if c not in cols]
 if missing:
     st.warning(f"Missing columns: {missing}. The app will still try to process available data.")
 else:
@@ -297,11 +376,20 @@ df = enrich_schedule(df_raw)
 # Filters
 # -------------------------------------------------
 col_f1, col_f2, col_f3, col_f4, col_f5 = st.columns(5)
-months = sorted(df["Month"].unique().tolist())
-weeks = sorted(df["Week"].unique().tolist())
-loc_focus = sorted(df["Location Focus"].unique().tolist())
-team_focus = sorted(df["Team Focus"].unique().tolist())
-modes = sorted(df["Mode of Connect"].dropna().unique().tolist())
+# Option lists only change with the data, so build them once per load.
+# (Not keyed on id(df): st.cache_data returns a new copy every rerun.)
+if st.session_state.get("filter_options_key") != data_key:
+    st.session_state["filter_options"] = {
+        c: df[c].cat.categories.tolist()
+        for c in ["Month", "Week", "Location Focus", "Team Focus", "Mode of Connect"]
+    }
+    st.session_state["filter_options_key"] = data_key
+options = st.session_state["filter_options"]
+months = options["Month"]
+weeks = options["Week"]
+loc_focus = options["Location Focus"]
+team_focus = options["Team Focus"]
+modes = options["Mode of Connect"]
 
 with col_f1:
     f_month = st.multiselect("Month", months, default=months)
@@ -314,50 +402,54 @@ with col_f4:
 with col_f5:
     f_mode = st.multiselect("Mode of Connect", modes, default=modes)
 
-mask = (
-    df["Month"].isin(f_month) &
-    df["Week"].isin(f_week) &
-    df["Location Focus"].isin(f_loc) &
-    df["Team Focus"].isin(f_team) &
-    df["Mode of Connect"].isin(f_mode)
-)
-df_f = df.loc[mask].sort_values(["Start (IST)", "Week"])
+masks = [
+    m for m in (
+        isin_mask(df["Month"], f_month, months),
+        isin_mask(df["Week"], f_week, weeks),
+        isin_mask(df["Location Focus"], f_loc, loc_focus),
+        isin_mask(df["Team Focus"], f_team, team_focus),
+        isin_mask(df["Mode of Connect"], f_mode, modes),
+    ) if m is not None
+]
+# Boolean selection keeps df's order, so df_f stays sorted by its Start index
+df_f = df.loc[np.logical_and.reduce(masks)] if masks else df
 
 # -------------------------------------------------
 # KPIs & upcoming sections
 # -------------------------------------------------
 now = datetime.now(IST)
 
-k1, k2, k3, k4 = st.columns(4)
+# df_f is indexed by start, so every upcoming window is a leading slice of this.
+# Rows without a start (NaT) sort last; stop before them.
+n_dated = len(df_f) - df_f.index.isna().sum()
+future = df_f.iloc[df_f.index.searchsorted(now, side="right"):n_dated]
+up_1d = upcoming_within(future, now, timedelta(days=1))
+up_30m = upcoming_within(future, now, timedelta(minutes=30))
+
+k1, k2, k3 = st.columns(3)
 with k1:
     st.metric("Total sessions (filtered)", len(df_f))
 with k2:
-    st.metric(
-        "Next session (local time)",
-        df_f[df_f["Start (IST)"] > now]["Start (IST)"].min().strftime("%b %d, %Y %I:%M %p")
-        if (df_f["Start (IST)"] > now).any() else "—"
-    )
+    st.metric("Upcoming within 1 day", len(up_1d))
 with k3:
-    st.metric("Upcoming within 1 day", len(upcoming_between(df_f, now, timedelta(days=1))))
-with k4:
-    st.metric("Upcoming within 30 min", len(upcoming_between(df_f, now, timedelta(minutes=30))))
+    st.metric("Upcoming within 30 min", len(up_30m))
 
 st.subheader("🔜 Upcoming Sessions")
-up_1d = upcoming_between(df_f, now, timedelta(days=1))
-up_30m = upcoming_between(df_f, now, timedelta(minutes=30))
 
 if len(up_1d):
     st.success("⏰ **Within 1 day**")
     st.dataframe(
         up_1d[["Month","Week","Start (IST)","Participants (4)","Location Focus","Mode of Connect","Manager"]],
-        use_container_width=True
+        use_container_width=True,
+        hide_index=True
     )
 
 if len(up_30m):
     st.warning("⏳ **Within 30 minutes**")
     st.dataframe(
         up_30m[["Month","Week","Start (IST)","Participants (4)","Location Focus","Mode of Connect","Manager"]],
-        use_container_width=True
+        use_container_width=True,
+        hide_index=True
     )
 
 # In-app toasts
@@ -365,19 +457,7 @@ toast_events(up_1d, "1-day reminder")
 toast_events(up_30m, "30-min reminder")
 
 # Browser notifications for events in current filter
-events_payload = []
-for _, r in df_f.iterrows():
-    if not isinstance(r["Start (IST)"], datetime):
-        continue
-    start_ts_ms = int(r["Start (IST)"].timestamp() * 1000)
-    title = f"{r['Week']} — {r['Start (IST)'].strftime('%b %d, %I:%M %p IST')}"
-    body = f"Participants: {r['Participants (4)']} • Focus: {r['Location Focus']} • Mode: {r.get('Mode of Connect','')}"
-    events_payload.append({
-        "id": f"{r['Start (IST)'].strftime('%Y%m%d%H%M')}-{r['Week']}",
-        "title": title,
-        "body": body,
-        "start_ts": start_ts_ms
-    })
+events_payload = notification_events(df_f)
 js_browser_notifications(events_payload)
 
 # -------------------------------------------------
@@ -389,7 +469,8 @@ st.dataframe(
         "Month #","Month","Week","Day","Date","Start (IST)","End (IST)",
         "Participants (4)","Manager","Location Focus","Team Focus","Mode of Connect","Notes"
     ]],
-    use_container_width=True
+    use_container_width=True,
+    hide_index=True
 )
 
 # -------------------------------------------------
@@ -398,30 +479,25 @@ st.dataframe(
 st.subheader("📅 Calendar Export")
 col_dl1, col_dl2 = st.columns(2)
 with col_dl1:
-    ics_all = ics_from_rows(df, cal_name="Coffee & Connect 2026 — All")
-    download_bytes("Coffee_Connect_2026_All.ics", ics_all.encode("utf-8"))
+    ics_all = ics_from_rows(df, data_key, cal_name="Coffee & Connect 2026 — All")
+    download_bytes("Coffee_Connect_2026_All.ics", ics_all)
 with col_dl2:
-    ics_filtered = ics_from_rows(df_f, cal_name="Coffee & Connect 2026 — Filtered")
-    download_bytes("Coffee_Connect_2026_Filtered.ics", ics_filtered.encode("utf-8"))
+    ics_filtered = ics_from_rows(
+        df_f,
+        # Order-insensitive, so reordering a selection reuses the same entry
+        (data_key, *(tuple(sorted(f, key=str)) for f in (f_month, f_week, f_loc, f_team, f_mode))),
+        cal_name="Coffee & Connect 2026 — Filtered"
+    )
+    download_bytes("Coffee_Connect_2026_Filtered.ics", ics_filtered)
 
 # -------------------------------------------------
-# Info & next session card
+# Info
 # -------------------------------------------------
 st.info(
     "🔔 **Notifications**:\n"
-    "• In-app toasts display automatically when within the 1-day or 30-min window.\n"
+    "• In-app toasts and the upcoming counts/tables refresh only when you interact with the page (e.g. change a filter).\n"
+    "• The next-session countdown above updates live in the browser.\n"
     "• Browser pop-ups require clicking ‘Enable browser notifications’ and keeping the tab open.\n"
     "• For guaranteed reminders even when the app is closed, import the ICS into Outlook/Google Calendar.\n\n"
     "📄 **Data source**: This app expects the exact column structure from your uploaded Excel."
 )
-
-next_df = df_f[df_f["Start (IST)"] > now].sort_values("Start (IST)").head(1)
-if not next_df.empty:
-    r = next_df.iloc[0]
-    st.success(
-        f"Next session: **{r['Week']}** — "
-        f"**{r['Start (IST)'].strftime('%b %d, %Y %I:%M %p IST')}** • "
-        f"Participants: {r['Participants (4)']} • Mode: {r.get('Mode of Connect','')}"
-    )
-else:
-    st.info("No future sessions in the current filter.")